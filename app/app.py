@@ -115,7 +115,7 @@ def main():
     # Display recent conversations
     st.subheader("Conversaciones Recientes")
     relevance_filter = st.selectbox(
-        "Filtrar por relevancia:", ["TODOS", "NO_RELEVANTE", "PARCIALMENTE_RELEVANTE", "RELEVANTE"]
+        "Filtrar por relevancia:", ["TODOS", "NO_RELEVANTE", "PARCIALMENTE_RELEVANTE", "RELEVANTE", "FAQ"]
     )
     recent_conversations = get_recent_conversations(
         limit=5, relevance=relevance_filter if relevance_filter != "TODOS" else None
@@ -5,17 +5,28 @@ import json
 from openai import OpenAI
 
 from elasticsearch import Elasticsearch
-from sentence_transformers import SentenceTransformer
+from embedding_client import EmbeddingClient
 
 
 ELASTIC_URL = os.getenv("ELASTIC_URL", "http://elasticsearch:9200")
 OLLAMA_URL = os.getenv("OLLAMA_URL", "http://ollama:11434/v1/")
 
+# FAQ fast path: answer straight from the index when the query is a close
+# paraphrase of a stored question. Off until FAQ_THRESHOLD has been tuned
+# with tune_faq.py; the default below is only a placeholder.
+FAQ_FAST_PATH = os.getenv("FAQ_FAST_PATH", "false").lower() == "true"
+FAQ_THRESHOLD = float(os.getenv("FAQ_THRESHOLD", "0.85"))
+FAQ_MODE = os.getenv("FAQ_MODE", "direct")  # "direct" or "template"
+
+# Candidates per shard for "Vector kNN"; at or above the index size the
+# approximate search returns the same hits as the exact script_score one
+KNN_NUM_CANDIDATES = int(os.getenv("KNN_NUM_CANDIDATES", "200"))
+
 
 es_client = Elasticsearch(ELASTIC_URL)
 ollama_client = OpenAI(base_url=OLLAMA_URL, api_key="ollama")
 
-model = SentenceTransformer("multi-qa-MiniLM-L6-cos-v1")
+model = EmbeddingClient("multi-qa-MiniLM-L6-cos-v1")
 
 
 def elastic_search_text(query, topic, index_name = "ch-questions"):
@@ -80,6 +91,84 @@ def elastic_search_knn_combined(vector, topic, index_name="ch-questions"):
 
     return [hit["_source"] for hit in es_results["hits"]["hits"]]
 
+def elastic_search_knn_precombined(vector, topic, index_name="ch-questions", num_candidates=None):
+    # Same ranking as elastic_search_knn_combined, scored with a single
+    # native kNN lookup on the precombined vector built in prep.py
+    if num_candidates is None:
+        num_candidates = KNN_NUM_CANDIDATES
+    search_query = {
+        "knn": {
+            "field": "combined_vector",
+            "query_vector": vector,
+            "k": 5,
+            "num_candidates": num_candidates,
+            "filter": {
+                "term": {
+                    "topic": topic
+                }
+            }
+        },
+        "_source": ["text", "section", "question", "topic", "id"]
+    }
+
+    es_results = es_client.search(index=index_name, body=search_query)
+
+    return [hit["_source"] for hit in es_results["hits"]["hits"]]
+
+
+def elastic_search_faq(vector, topic, index_name="ch-questions"):
+    search_query = {
+        "size": 1,
+        "query": {
+            "script_score": {
+                "query": {
+                    "term": {
+                        "topic": topic
+                    }
+                },
+                "script": {
+                    "source": "cosineSimilarity(params.query_vector, 'question_vector') + 1",
+                    "params": {
+                        "query_vector": vector
+                    }
+                }
+            }
+        },
+        "_source": ["text", "section", "question", "topic", "id"]
+    }
+
+    es_results = es_client.search(index=index_name, body=search_query)
+    hits = es_results["hits"]["hits"]
+    if not hits:
+        return None, 0.0
+
+    # script_score must be non-negative, so the cosine was shifted by 1
+    return hits[0]["_source"], hits[0]["_score"] - 1
+
+
+def build_faq_answer(doc):
+    if FAQ_MODE == "template":
+        return f"De acuerdo con la sección \"{doc['section']}\": {doc['text']}"
+    return doc['text']
+
+
+def faq_answer(doc, similarity, response_time):
+    return {
+        'answer': build_faq_answer(doc),
+        'response_time': response_time,
+        # Not rated by the judge, so keep it apart from the judged labels
+        'relevance': 'FAQ',
+        'relevance_explanation': f"Respuesta tomada de la FAQ '{doc['id']}' (similitud {similarity:.3f}), sin evaluar por el juez",
+        'model_used': f"faq/{FAQ_MODE}",
+        'prompt_tokens': 0,
+        'completion_tokens': 0,
+        'total_tokens': 0,
+        'eval_prompt_tokens': 0,
+        'eval_completion_tokens': 0,
+        'eval_total_tokens': 0,
+    }
+
+
 def build_prompt(query, search_results):
     prompt_template = """
     Tu eres un experto en el municipio de Puebla y el Centro Histórico de Puebla. Responde la PREGUNTA basandote en el CONTEXTO proveniente de la base de datos FAQ.
@@ -154,9 +243,21 @@ def evaluate_relevance(question, answer):
 
 
 def get_answer(query, topic, model_choice, search_type):
-    if search_type == 'Vector':
+    vector = None
+    if FAQ_FAST_PATH:
+        start_time = time.time()
         vector = model.encode(query)
-        search_results = elastic_search_knn_combined(vector, topic)
+        doc, similarity = elastic_search_faq(vector, topic)
+        if doc is not None and similarity >= FAQ_THRESHOLD:
+            return faq_answer(doc, similarity, time.time() - start_time)
+
+    if search_type in ('Vector', 'Vector kNN'):
+        if vector is None:
+            vector = model.encode(query)
+        if search_type == 'Vector kNN':
+            search_results = elastic_search_knn_precombined(vector, topic)
+        else:
+            search_results = elastic_search_knn_combined(vector, topic)
     else:
         search_results = elastic_search_text(query, topic)
 
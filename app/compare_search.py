@@ -0,0 +1,33 @@
+from assistant import (
+    model,
+    elastic_search_knn_combined,
+    elastic_search_knn_precombined,
+)
+from prep import fetch_ground_truth
+from tqdm.auto import tqdm
+
+
+def compare_rankings(ground_truth):
+    mismatches = []
+    for rec in tqdm(ground_truth):
+        vector = model.encode(rec["question"])
+        combined = [doc["id"] for doc in elastic_search_knn_combined(vector, rec["topic"])]
+        precombined = [doc["id"] for doc in elastic_search_knn_precombined(vector, rec["topic"])]
+        if combined != precombined:
+            mismatches.append((rec["question"], combined, precombined))
+    return mismatches
+
+
+def main():
+    ground_truth = fetch_ground_truth()
+    mismatches = compare_rankings(ground_truth)
+
+    for question, combined, precombined in mismatches:
+        print(f"Q: {question}")
+        print(f"  script_score: {combined}")
+        print(f"  kNN:          {precombined}")
+    print(f"{len(ground_truth) - len(mismatches)}/{len(ground_truth)} queries ranked identically")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 import os
+import time
+import threading
 import psycopg2
 from psycopg2.extras import DictCursor
 from datetime import datetime
@@ -6,6 +8,59 @@ from zoneinfo import ZoneInfo
 
 tz = ZoneInfo("America/Mexico_City")
 
+# Dashboard reads are cached per process so every Streamlit session shares them.
+# Writes below invalidate the affected entries; the TTL only covers writes made
+# from other processes (e.g. generate_data.py).
+CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", "10"))
+
+_cache = {}
+_cache_generation = {"conversations": 0, "feedback": 0}
+_cache_lock = threading.Lock()
+_loading_locks = {}
+
+
+def _cache_get(cache_key):
+    with _cache_lock:
+        entry = _cache.get(cache_key)
+        if entry is not None and entry[0] > time.monotonic():
+            return True, entry[1]
+        return False, None
+
+
+def _cached(group, key, loader):
+    cache_key = (group, key)
+    hit, value = _cache_get(cache_key)
+    if hit:
+        return value
+
+    with _cache_lock:
+        loading_lock = _loading_locks.setdefault(cache_key, threading.Lock())
+
+    # Single flight: one caller per key queries Postgres, the rest wait for it
+    with loading_lock:
+        hit, value = _cache_get(cache_key)
+        if hit:
+            return value
+
+        with _cache_lock:
+            generation = _cache_generation[group]
+
+        value = loader()
+
+        with _cache_lock:
+            # Skip storing if a write happened while we were reading
+            if _cache_generation[group] == generation:
+                _cache[cache_key] = (time.monotonic() + CACHE_TTL, value)
+        return value
+
+
+def invalidate_cache(*groups):
+    with _cache_lock:
+        for group in groups:
+            _cache_generation[group] += 1
+            for cache_key in [k for k in _cache if k[0] == group]:
+                del _cache[cache_key]
+
 
 def get_db_connection():
     return psycopg2.connect(
@@ -53,6 +108,7 @@ def init_db():
         conn.commit()
     finally:
         conn.close()
+    invalidate_cache("conversations", "feedback")
 
 
 def save_conversation(conversation_id, question, answer_data, topic, timestamp=None):
@@ -91,6 +147,7 @@ def save_conversation(conversation_id, question, answer_data, topic, timestamp=N
         conn.commit()
     finally:
         conn.close()
+    invalidate_cache("conversations")
 
 
 def save_feedback(conversation_id, feedback, timestamp=None):
@@ -107,9 +164,19 @@ def save_feedback(conversation_id, feedback, timestamp=None):
         conn.commit()
     finally:
         conn.close()
+    # Recent conversations join the feedback table, so both are stale
+    invalidate_cache("conversations", "feedback")
 
 
 def get_recent_conversations(limit=5, relevance=None):
+    return _cached(
+        "conversations",
+        (limit, relevance),
+        lambda: _fetch_recent_conversations(limit, relevance),
+    )
+
+
+def _fetch_recent_conversations(limit, relevance):
     conn = get_db_connection()
     try:
         with conn.cursor(cursor_factory=DictCursor) as cur:
@@ -129,6 +196,10 @@ def get_recent_conversations(limit=5, relevance=None):
 
 
 def get_feedback_stats():
+    return _cached("feedback", None, _fetch_feedback_stats)
+
+
+def _fetch_feedback_stats():
     conn = get_db_connection()
     try:
         with conn.cursor(cursor_factory=DictCursor) as cur:
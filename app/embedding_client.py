@@ -0,0 +1,62 @@
+import os
+import json
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+
+EMBEDDING_SERVICE_URL = os.getenv("EMBEDDING_SERVICE_URL")
+EMBEDDING_TIMEOUT = float(os.getenv("EMBEDDING_TIMEOUT", "30"))
+DEFAULT_MODEL_NAME = "multi-qa-MiniLM-L6-cos-v1"
+
+
+class EmbeddingClient:
+    """Drop-in replacement for SentenceTransformer.encode.
+
+    Talks to embedding_service.py when EMBEDDING_SERVICE_URL is set and
+    loads the model in-process otherwise.
+    """
+
+    def __init__(self, model_name=None, service_url=EMBEDDING_SERVICE_URL, timeout=EMBEDDING_TIMEOUT):
+        self.model_name = model_name or os.getenv("MODEL_NAME") or DEFAULT_MODEL_NAME
+        self.service_url = service_url.rstrip("/") if service_url else None
+        self.timeout = timeout
+        self.model = None
+        if self.service_url is None:
+            from sentence_transformers import SentenceTransformer
+
+            self.model = SentenceTransformer(self.model_name)
+
+    def _remote_encode(self, texts):
+        request = urllib.request.Request(
+            f"{self.service_url}/encode",
+            # The service rejects a different model, so the index and the
+            # queries can't silently end up in different embedding spaces
+            data=json.dumps({"texts": texts, "model": self.model_name}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return np.array(json.loads(response.read())["vectors"], dtype=np.float32)
+        except urllib.error.HTTPError as e:
+            raise RuntimeError(f"Embedding service error {e.code}: {e.read().decode('utf-8', 'replace')}") from e
+
+    def encode(self, sentences, normalize_embeddings=False):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        if self.model is not None:
+            vectors = self.model.encode(texts)
+        else:
+            vectors = self._remote_encode(texts)
+
+        if normalize_embeddings:
+            vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors[0] if single else vectors
+
+    def metrics(self):
+        if self.service_url is None:
+            return None
+        with urllib.request.urlopen(f"{self.service_url}/metrics", timeout=self.timeout) as response:
+            return json.loads(response.read())
@@ -0,0 +1,222 @@
+import os
+import json
+import time
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sentence_transformers import SentenceTransformer
+
+
+MODEL_NAME = os.getenv("MODEL_NAME", "multi-qa-MiniLM-L6-cos-v1")
+EMBEDDING_HOST = os.getenv("EMBEDDING_HOST", "0.0.0.0")
+EMBEDDING_PORT = int(os.getenv("EMBEDDING_PORT", "8000"))
+MAX_BATCH_SIZE = int(os.getenv("EMBEDDING_MAX_BATCH_SIZE", "32"))
+MAX_WAIT_MS = float(os.getenv("EMBEDDING_MAX_WAIT_MS", "10"))
+REQUEST_TIMEOUT = float(os.getenv("EMBEDDING_REQUEST_TIMEOUT", "30"))
+
+
+def print_log(message):
+    print(message, flush=True)
+
+
+class EncodeRequest:
+    def __init__(self, texts):
+        self.texts = texts
+        self.enqueued_at = time.monotonic()
+        self.done = threading.Event()
+        self.vectors = None
+        self.error = None
+
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+        self.texts = 0
+        self.max_batch_size = 0
+        self.queue_wait_ms_total = 0.0
+        self.queue_wait_ms_max = 0.0
+        self.encode_ms_total = 0.0
+
+    def record_batch(self, batch, batch_size, started_at, encode_ms):
+        with self.lock:
+            self.batches += 1
+            self.requests += len(batch)
+            self.texts += batch_size
+            self.max_batch_size = max(self.max_batch_size, batch_size)
+            self.encode_ms_total += encode_ms
+            for request in batch:
+                wait_ms = (started_at - request.enqueued_at) * 1000
+                self.queue_wait_ms_total += wait_ms
+                self.queue_wait_ms_max = max(self.queue_wait_ms_max, wait_ms)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "batches": self.batches,
+                "requests": self.requests,
+                "texts": self.texts,
+                "avg_batch_size": self.texts / self.batches if self.batches else 0.0,
+                "max_batch_size": self.max_batch_size,
+                "avg_queue_wait_ms": self.queue_wait_ms_total / self.requests if self.requests else 0.0,
+                "max_queue_wait_ms": self.queue_wait_ms_max,
+                "avg_encode_ms": self.encode_ms_total / self.batches if self.batches else 0.0,
+            }
+
+
+class MicroBatcher:
+    """Collects concurrent encode requests and runs them through one model call.
+
+    A batch is flushed when adding the next request would exceed
+    MAX_BATCH_SIZE texts or when the oldest request has waited MAX_WAIT_MS,
+    whichever comes first. A single request larger than MAX_BATCH_SIZE gets
+    a batch of its own and is chunked by the model.
+    """
+
+    def __init__(self, model, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS,
+                 request_timeout=REQUEST_TIMEOUT):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.request_timeout = request_timeout
+        self.queue = queue.Queue()
+        self.pending = None
+        self.metrics = Metrics()
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def encode(self, texts):
+        request = EncodeRequest(texts)
+        self.queue.put(request)
+        if not request.done.wait(self.request_timeout):
+            raise TimeoutError(f"Encode request timed out after {self.request_timeout}s")
+        if request.error is not None:
+            raise request.error
+        return request.vectors
+
+    def _collect(self):
+        if self.pending is not None:
+            first, self.pending = self.pending, None
+        else:
+            first = self.queue.get()
+        batch = [first]
+        batch_size = len(first.texts)
+        deadline = first.enqueued_at + self.max_wait
+        while batch_size < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                request = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if batch_size + len(request.texts) > self.max_batch_size:
+                # Doesn't fit; it starts the next batch instead
+                self.pending = request
+                break
+            batch.append(request)
+            batch_size += len(request.texts)
+        return batch, batch_size
+
+    def _encode_batch(self, batch, batch_size):
+        started_at = time.monotonic()
+        texts = [text for request in batch for text in request.texts]
+        vectors = self.model.encode(texts, batch_size=self.max_batch_size).tolist()
+        encode_ms = (time.monotonic() - started_at) * 1000
+        self.metrics.record_batch(batch, batch_size, started_at, encode_ms)
+
+        offset = 0
+        for request in batch:
+            request.vectors = vectors[offset:offset + len(request.texts)]
+            offset += len(request.texts)
+
+    def _run(self):
+        while True:
+            batch = []
+            try:
+                batch, batch_size = self._collect()
+                self._encode_batch(batch, batch_size)
+            except Exception as e:
+                # Fail this batch only; the worker must keep serving
+                print_log(f"Embedding batch failed: {e!r}")
+                for request in batch:
+                    if request.vectors is None:
+                        request.error = e
+            finally:
+                for request in batch:
+                    request.done.set()
+
+
+class EmbeddingHandler(BaseHTTPRequestHandler):
+    batcher = None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            self._send_json(200, self.batcher.metrics.snapshot())
+        elif self.path == "/health":
+            self._send_json(200, {"status": "ok", "model": MODEL_NAME})
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/encode":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length))
+        except ValueError as e:
+            self._send_json(400, {"error": f"Invalid request: {e}"})
+            return
+
+        texts = payload.get("texts") if isinstance(payload, dict) else None
+        if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+            self._send_json(400, {"error": "'texts' must be a list of strings"})
+            return
+        model = payload.get("model")
+        if model is not None and model != MODEL_NAME:
+            self._send_json(400, {"error": f"Service encodes with '{MODEL_NAME}', not '{model}'"})
+            return
+        if not texts:
+            self._send_json(200, {"vectors": []})
+            return
+
+        try:
+            vectors = self.batcher.encode(texts)
+        except TimeoutError as e:
+            self._send_json(504, {"error": str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+        self._send_json(200, {"vectors": vectors})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    print_log(f"Loading model: {MODEL_NAME}")
+    EmbeddingHandler.batcher = MicroBatcher(SentenceTransformer(MODEL_NAME))
+
+    server = ThreadingHTTPServer((EMBEDDING_HOST, EMBEDDING_PORT), EmbeddingHandler)
+    print_log(
+        f"Embedding service listening on {EMBEDDING_HOST}:{EMBEDDING_PORT} "
+        f"(max batch size {MAX_BATCH_SIZE}, max wait {MAX_WAIT_MS} ms)"
+    )
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
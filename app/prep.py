@@ -1,7 +1,9 @@
 import os
+import argparse
 import requests
+import numpy as np
 import pandas as pd
-from sentence_transformers import SentenceTransformer
+from embedding_client import EmbeddingClient
 from elasticsearch import Elasticsearch
 from tqdm.auto import tqdm
 from dotenv import load_dotenv
@@ -17,6 +19,9 @@ INDEX_NAME = os.getenv("INDEX_NAME")
 
 BASE_URL = "https://raw.githubusercontent.com/AdairPonceuwu/ch_llm/main"
 
+# Documents encoded per model call (three texts each)
+ENCODE_CHUNK_SIZE = int(os.getenv("ENCODE_CHUNK_SIZE", "32"))
+
 
 
 
@@ -35,14 +40,15 @@ def fetch_documents():
     return documents
 
 
-def fetch_ground_truth():
+def fetch_ground_truth(topic=None):
     print("Fetching ground truth data...")
     relative_url = "data_csv/ground-truth-data.csv"
     ground_truth_url = f"{BASE_URL}/{relative_url}?raw=1"
     df_ground_truth = pd.read_csv(ground_truth_url)
-    df_ground_truth = df_ground_truth[
-        df_ground_truth.topic == "PMD"
-    ]
+    if topic is not None:
+        df_ground_truth = df_ground_truth[
+            df_ground_truth.topic == topic
+        ]
     ground_truth = df_ground_truth.to_dict(orient="records")
     print(f"Fetched {len(ground_truth)} ground truth records")
     return ground_truth
@@ -50,7 +56,7 @@ def fetch_ground_truth():
 
 def load_model():
     print(f"Loading model: {MODEL_NAME}")
-    return SentenceTransformer(MODEL_NAME)
+    return EmbeddingClient(MODEL_NAME)
 
 
 def setup_elasticsearch():
@@ -84,6 +90,18 @@ def setup_elasticsearch():
                     "index": True,
                     "similarity": "cosine",
                 },
+                # Sum of the three unit vectors above; not unit length, so it
+                # needs max_inner_product to keep the combined ranking. This
+                # and index_options need Elasticsearch 8.11 or newer. Plain
+                # hnsw keeps float vectors (8.14 defaults to int8_hnsw), so kNN
+                # scores match the script_score search exactly.
+                "combined_vector": {
+                    "type": "dense_vector",
+                    "dims": 384,
+                    "index": True,
+                    "similarity": "max_inner_product",
+                    "index_options": {"type": "hnsw"},
+                },
             }
         },
     }
@@ -94,16 +112,39 @@ def setup_elasticsearch():
     return es_client
 
 
+def combine_vectors(*vectors):
+    # q.a/|a| + q.b/|b| + q.c/|c| == q.(a/|a| + b/|b| + c/|c|), so one dot
+    # product against this sum ranks like the three cosineSimilarity calls
+    return sum(v / np.linalg.norm(v) for v in vectors)
+
+
+def encode_documents(documents, model):
+    # One encode call per chunk so the model (or embedding service) sees
+    # full batches instead of one text at a time
+    vectors = []
+    for start in tqdm(range(0, len(documents), ENCODE_CHUNK_SIZE)):
+        texts = []
+        for doc in documents[start:start + ENCODE_CHUNK_SIZE]:
+            question = doc['question']
+            text = doc['text']
+            texts.extend([question, text, question + ' ' + text])
+        encoded = model.encode(texts)
+        vectors.extend(zip(encoded[0::3], encoded[1::3], encoded[2::3]))
+    return vectors
+
+
 def index_documents(es_client, documents, model):
+    print("Encoding documents...")
+    vectors = encode_documents(documents, model)
+
     print("Indexing documents...")
-    for doc in tqdm(documents):
-        question = doc['question']
-        text = doc['text']
-        qt = question + ' ' + text
-
-        doc['question_vector'] = model.encode(question).tolist()
-        doc['text_vector'] = model.encode(text).tolist()
-        doc['question_text_vector'] = model.encode(qt).tolist()
+    for doc, (question_vector, text_vector, question_text_vector) in zip(tqdm(documents), vectors):
+        doc['question_vector'] = question_vector.tolist()
+        doc['text_vector'] = text_vector.tolist()
+        doc['question_text_vector'] = question_text_vector.tolist()
+        doc['combined_vector'] = combine_vectors(
+            question_vector, text_vector, question_text_vector
+        ).tolist()
         es_client.index(index=INDEX_NAME, document=doc)
     print(f"Indexed {len(documents)} documents")
 
@@ -111,19 +152,30 @@ def index_documents(es_client, documents, model):
 
 
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--reindex-only",
+        action="store_true",
+        help="rebuild the Elasticsearch index without init_db (which drops conversations and feedback)",
+    )
+    args = parser.parse_args()
+
     # you may consider to comment <start>
     # if you just want to init the db or didn't want to re-index
     print("Starting the indexing process...")
 
     documents = fetch_documents()
-    ground_truth = fetch_ground_truth()
+    ground_truth = fetch_ground_truth(topic="PMD")
     model = load_model()
     es_client = setup_elasticsearch()
     index_documents(es_client, documents, model)
     # you may consider to comment <end>
 
-    print("Initializing database...")
-    init_db()
+    if args.reindex_only:
+        print("Skipping database initialization (--reindex-only)")
+    else:
+        print("Initializing database...")
+        init_db()
 
     print("Indexing process completed successfully!")
 
@@ -0,0 +1,102 @@
+import os
+import random
+import numpy as np
+from dotenv import load_dotenv
+
+from prep import fetch_documents, fetch_ground_truth, load_model
+
+load_dotenv()
+
+TARGET_PRECISION = float(os.getenv("FAQ_TARGET_PRECISION", "0.95"))
+HOLDOUT_FRACTION = float(os.getenv("FAQ_HOLDOUT_FRACTION", "0.3"))
+SPLIT_SEED = int(os.getenv("FAQ_SPLIT_SEED", "42"))
+
+
+def split_ground_truth(ground_truth):
+    # Split by document so paraphrases of one FAQ entry stay on the same side
+    documents = sorted({rec["document"] for rec in ground_truth})
+    random.Random(SPLIT_SEED).shuffle(documents)
+    holdout_documents = set(documents[:int(len(documents) * HOLDOUT_FRACTION)])
+
+    tuning = [rec for rec in ground_truth if rec["document"] not in holdout_documents]
+    holdout = [rec for rec in ground_truth if rec["document"] in holdout_documents]
+    return tuning, holdout
+
+
+def top_question_hits(documents, ground_truth, model):
+    print("Encoding stored questions...")
+    doc_vectors = model.encode(
+        [doc["question"] for doc in documents], normalize_embeddings=True
+    )
+    doc_ids = np.array([doc["id"] for doc in documents])
+    doc_topics = np.array([doc["topic"] for doc in documents])
+
+    print("Encoding ground truth questions...")
+    query_vectors = model.encode(
+        [rec["question"] for rec in ground_truth], normalize_embeddings=True
+    )
+
+    # Same as elastic_search_faq: best question_vector match within the topic
+    hits = []
+    for rec, query_vector in zip(ground_truth, query_vectors):
+        mask = doc_topics == rec["topic"]
+        scores = doc_vectors[mask].dot(query_vector)
+        best = scores.argmax()
+        hits.append((scores[best], doc_ids[mask][best] == rec["document"]))
+    return hits
+
+
+def evaluate_threshold(hits, threshold):
+    matched = [correct for similarity, correct in hits if similarity >= threshold]
+    # A threshold that never fires has no precision to speak of
+    precision = sum(matched) / len(matched) if matched else None
+    coverage = len(matched) / len(hits)
+    return precision, coverage
+
+
+def evaluate_thresholds(hits, thresholds):
+    return [(threshold, *evaluate_threshold(hits, threshold)) for threshold in thresholds]
+
+
+def format_precision(precision):
+    return "n/a" if precision is None else f"{precision:.3f}"
+
+
+def main():
+    documents = fetch_documents()
+    ground_truth = fetch_ground_truth()
+    model = load_model()
+
+    tuning, holdout = split_ground_truth(ground_truth)
+    print(f"Tuning on {len(tuning)} queries, validating on {len(holdout)} held-out queries")
+
+    tuning_hits = top_question_hits(documents, tuning, model)
+    results = evaluate_thresholds(tuning_hits, np.arange(0.50, 1.00, 0.01))
+
+    print("threshold  precision  coverage  (tuning set)")
+    for threshold, precision, coverage in results:
+        print(f"{threshold:9.2f}  {format_precision(precision):>9}  {coverage:8.3f}")
+
+    candidates = [
+        r for r in results
+        if r[1] is not None and r[1] >= TARGET_PRECISION and r[2] > 0
+    ]
+    if not candidates:
+        print(f"No threshold reaches precision {TARGET_PRECISION}")
+        return
+
+    threshold = candidates[0][0]
+    holdout_hits = top_question_hits(documents, holdout, model)
+    precision, coverage = evaluate_threshold(holdout_hits, threshold)
+    print(
+        f"Held-out at {threshold:.2f}: precision {format_precision(precision)}, "
+        f"fast path on {coverage:.1%} of queries"
+    )
+    if precision is None or precision < TARGET_PRECISION:
+        print(f"Held-out precision is below {TARGET_PRECISION}; do not enable the fast path with it")
+    else:
+        print(f"Recommended FAQ_THRESHOLD={threshold:.2f}")
+
+
+if __name__ == "__main__":
+    main()